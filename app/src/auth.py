@@ -0,0 +1,44 @@
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+import hmac
+import os
+
+API_TOKEN = os.getenv("API_TOKEN", "CHANGE-THIS-TOKEN-IN-PRODUCTION")
+_API_TOKEN_BYTES = API_TOKEN.encode()
+
+# Paths served without a token
+PUBLIC_PATHS = frozenset({"/health", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"})
+
+# Authentication middleware
+class BearerAuthMiddleware:
+    """Reject requests without a valid bearer token before routing, validation or DB access"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = next((value for name, value in scope["headers"] if name == b"authorization"), None)
+        if authorization is None:
+            response = ORJSONResponse({"detail": "Not authenticated"}, status_code=status.HTTP_403_FORBIDDEN)
+        else:
+            scheme, _, token = authorization.partition(b" ")
+            if scheme.lower() != b"bearer" or not token:
+                response = ORJSONResponse(
+                    {"detail": "Invalid authentication credentials"},
+                    status_code=status.HTTP_403_FORBIDDEN
+                )
+            # Constant-time comparison so the token cannot be recovered through response timing
+            elif not hmac.compare_digest(token, _API_TOKEN_BYTES):
+                response = ORJSONResponse(
+                    {"detail": "Invalid authentication token"},
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    headers={"WWW-Authenticate": "Bearer"}
+                )
+            else:
+                await self.app(scope, receive, send)
+                return
+        await response(scope, receive, send)
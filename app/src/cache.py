@@ -0,0 +1,98 @@
+from fastapi import Response
+from functools import wraps
+from typing import Optional
+import orjson
+import os
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+# Cache configuration (caching is disabled when REDIS_URL is empty)
+REDIS_URL = os.getenv("REDIS_URL", "")
+CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+# Seconds to wait on Redis before treating the call as a miss and using the database
+CACHE_SOCKET_TIMEOUT = float(os.getenv("CACHE_SOCKET_TIMEOUT", "0.1"))
+# Milliseconds an invalidated key stays blocked so an in-flight miss can't write back a stale row
+CACHE_TOMBSTONE_MS = int(os.getenv("CACHE_TOMBSTONE_MS", "1000"))
+
+# Response cache
+class RedisCache:
+    """Cache-aside store for serialized responses, backed by Redis"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.client: Optional[redis.Redis] = None
+
+    async def connect(self):
+        if self.url:
+            self.client = redis.from_url(
+                self.url,
+                socket_timeout=CACHE_SOCKET_TIMEOUT,
+                socket_connect_timeout=CACHE_SOCKET_TIMEOUT,
+            )
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.client is None:
+            return None
+        try:
+            return await self.client.get(key)
+        except RedisError:
+            return None
+
+    async def set(self, key: str, value: bytes, expire: int = CACHE_TTL):
+        """Fill `key` unless it is already set, so a fill never overwrites an invalidation tombstone"""
+        if self.client is None:
+            return
+        try:
+            await self.client.set(key, value, ex=expire, nx=True)
+        except RedisError:
+            pass
+
+    async def invalidate(self, *keys: str):
+        """Replace `keys` with short-lived empty tombstones, which read as misses but block fills"""
+        if self.client is None:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, b"", px=CACHE_TOMBSTONE_MS)
+                await pipe.execute()
+        except RedisError:
+            pass
+
+cache = RedisCache(REDIS_URL)
+
+def cached_response(payload: bytes) -> Response:
+    return Response(content=payload, media_type="application/json")
+
+def cached(key: str, expire: int = CACHE_TTL):
+    """Serve the endpoint cache-aside under `key`, formatted with the endpoint's arguments"""
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            cache_key = key.format(**kwargs)
+            payload = await cache.get(cache_key)
+            # An empty payload is an invalidation tombstone and counts as a miss
+            if payload:
+                return cached_response(payload)
+
+            payload = orjson.dumps(await endpoint(**kwargs))
+            await cache.set(cache_key, payload, expire=expire)
+            return cached_response(payload)
+        return wrapper
+    return decorator
+
+def invalidates(*keys: str):
+    """Invalidate the given cache keys after the endpoint completes successfully"""
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            result = await endpoint(**kwargs)
+            await cache.invalidate(*(key.format(**kwargs) for key in keys))
+            return result
+        return wrapper
+    return decorator
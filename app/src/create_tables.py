@@ -0,0 +1,13 @@
+import asyncio
+
+from .db import Base, engine
+
+async def create_tables():
+    """Create missing tables; run once before the workers start, never from their lifespan"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+# The Docker image runs `python -m src.create_tables` ahead of uvicorn when AUTO_CREATE_TABLES=1
+if __name__ == "__main__":
+    asyncio.run(create_tables())
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, String, Text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+import os
+
+# Database configuration
+DATABASE_URL = os.getenv("DATABASE_URL", "mysql+aiomysql://user:password@db:3306/perfcons")
+
+# Connection pool configuration (per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+# Async engines use AsyncAdaptedQueuePool by default; do not pass poolclass=QueuePool
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=DB_POOL_RECYCLE,
+)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+Base = declarative_base()
+
+# Database models
+class Fact(Base):
+    __tablename__ = "facts"
+    
+    conversation_id = Column(String(255), primary_key=True)
+    fact = Column(Text(16000), nullable=False)
+
+class Budget(Base):
+    __tablename__ = "budgets"
+    
+    conversation_id = Column(String(255), primary_key=True)
+    budget = Column(Text(100000), nullable=False)
+
+# Dependency to get DB session
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
@@ -0,0 +1,26 @@
+import os
+
+# Page sizes for list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Maximum number of rows accepted by a single batch write
+MAX_BATCH_SIZE = 1000
+# Upper bound on the row data in one batch INSERT; with every character escaped the
+# statement stays well below MariaDB's default 16 MB max_allowed_packet
+MAX_BATCH_STATEMENT_BYTES = int(os.getenv("MAX_BATCH_STATEMENT_BYTES", str(4 * 1024 * 1024)))
+
+def packet_sized_chunks(rows, max_bytes: int = MAX_BATCH_STATEMENT_BYTES):
+    """Split `rows` (dicts of strings) into consecutive lists whose encoded size stays under `max_bytes`"""
+    chunk = []
+    size = 0
+    for row in rows:
+        row_size = sum(len(value.encode()) for value in row.values())
+        if chunk and size + row_size > max_bytes:
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(row)
+        size += row_size
+    if chunk:
+        yield chunk
@@ -1,261 +1,56 @@
-from fastapi import FastAPI, Header, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
-from typing import Optional, List
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import ORJSONResponse
+from pathlib import Path
 import os
-from sqlalchemy import create_engine, Column, String, Text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 
-# Database configuration
-DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://user:password@db:3306/perfcons")
-API_TOKEN = os.getenv("API_TOKEN", "CHANGE-THIS-TOKEN-IN-PRODUCTION")
-
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-# Database models
-class Fact(Base):
-    __tablename__ = "facts"
-    
-    conversation_id = Column(String(255), primary_key=True, index=True)
-    fact = Column(Text(16000), nullable=False)
-
-class Budget(Base):
-    __tablename__ = "budgets"
-    
-    conversation_id = Column(String(255), primary_key=True, index=True)
-    budget = Column(Text(100000), nullable=False)
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-# Pydantic models
-class FactCreate(BaseModel):
-    fact: str
-
-class FactUpdate(BaseModel):
-    fact: str
-
-class FactResponse(BaseModel):
-    conversation_id: str
-    fact: str
-    
-    class Config:
-        from_attributes = True
-
-class BudgetCreate(BaseModel):
-    budget: str
-
-class BudgetUpdate(BaseModel):
-    budget: str
-
-class BudgetResponse(BaseModel):
-    conversation_id: str
-    budget: str
-    
-    class Config:
-        from_attributes = True
+from .auth import BearerAuthMiddleware
+from .cache import cache
+from .db import engine
+from .routers import budgets, facts
+
+# File created once startup completes so test runners can wait on it instead of polling /health
+READY_FILE = os.getenv("READY_FILE", "")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await cache.connect()
+    if READY_FILE:
+        Path(READY_FILE).touch()
+    yield
+    if READY_FILE:
+        Path(READY_FILE).unlink(missing_ok=True)
+    await cache.close()
+    await engine.dispose()
 
 # FastAPI app
 app = FastAPI(
     title="Perfcons API",
     description="REST API for managing facts and budgets associated with conversation IDs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-security = HTTPBearer()
+app.add_middleware(BearerAuthMiddleware)
+app.include_router(facts.router)
+app.include_router(budgets.router)
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def custom_openapi():
+    """Document the bearer token enforced by BearerAuthMiddleware so Swagger can send it"""
+    if app.openapi_schema is None:
+        schema = get_openapi(title=app.title, version=app.version, description=app.description, routes=app.routes)
+        schema.setdefault("components", {})["securitySchemes"] = {
+            "HTTPBearer": {"type": "http", "scheme": "bearer"}
+        }
+        schema["security"] = [{"HTTPBearer": []}]
+        app.openapi_schema = schema
+    return app.openapi_schema
 
-# Authentication middleware
-async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    if credentials.credentials != API_TOKEN:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return credentials.credentials
+app.openapi = custom_openapi
 
-# CRUD endpoints
-@app.post("/facts", response_model=FactResponse, status_code=status.HTTP_201_CREATED)
-async def create_fact(
-    fact_data: FactCreate,
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Create a new fact for a conversation ID"""
-    # Check if fact already exists
-    existing_fact = db.query(Fact).filter(Fact.conversation_id == conversation_id).first()
-    if existing_fact:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Fact already exists for this conversation ID"
-        )
-    
-    db_fact = Fact(conversation_id=conversation_id, fact=fact_data.fact)
-    db.add(db_fact)
-    db.commit()
-    db.refresh(db_fact)
-    return db_fact
-
-@app.get("/facts", response_model=FactResponse)
-async def read_fact(
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Retrieve a fact by conversation ID"""
-    fact = db.query(Fact).filter(Fact.conversation_id == conversation_id).first()
-    if not fact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Fact not found for this conversation ID"
-        )
-    return fact
-
-@app.get("/facts/all", response_model=List[FactResponse])
-async def read_all_facts(
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Retrieve all facts"""
-    facts = db.query(Fact).all()
-    return facts
-
-@app.put("/facts", response_model=FactResponse)
-async def update_fact(
-    fact_data: FactUpdate,
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Update a fact by conversation ID"""
-    fact = db.query(Fact).filter(Fact.conversation_id == conversation_id).first()
-    if not fact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Fact not found for this conversation ID"
-        )
-    
-    fact.fact = fact_data.fact
-    db.commit()
-    db.refresh(fact)
-    return fact
-
-@app.delete("/facts", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_fact(
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Delete a fact by conversation ID"""
-    fact = db.query(Fact).filter(Fact.conversation_id == conversation_id).first()
-    if not fact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Fact not found for this conversation ID"
-        )
-    
-    db.delete(fact)
-    db.commit()
-    return None
-
-@app.get("/health")
+@app.get("/health", openapi_extra={"security": []})
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
-
-# Budget CRUD endpoints
-@app.post("/budgets", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
-async def create_budget(
-    budget_data: BudgetCreate,
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Create a new budget for a conversation ID"""
-    # Check if budget already exists
-    existing_budget = db.query(Budget).filter(Budget.conversation_id == conversation_id).first()
-    if existing_budget:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Budget already exists for this conversation ID"
-        )
-    
-    db_budget = Budget(conversation_id=conversation_id, budget=budget_data.budget)
-    db.add(db_budget)
-    db.commit()
-    db.refresh(db_budget)
-    return db_budget
-
-@app.get("/budgets", response_model=BudgetResponse)
-async def read_budget(
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Retrieve a budget by conversation ID"""
-    budget = db.query(Budget).filter(Budget.conversation_id == conversation_id).first()
-    if not budget:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Budget not found for this conversation ID"
-        )
-    return budget
-
-@app.get("/budgets/all", response_model=List[BudgetResponse])
-async def read_all_budgets(
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Retrieve all budgets"""
-    budgets = db.query(Budget).all()
-    return budgets
-
-@app.put("/budgets", response_model=BudgetResponse)
-async def update_budget(
-    budget_data: BudgetUpdate,
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Update a budget by conversation ID"""
-    budget = db.query(Budget).filter(Budget.conversation_id == conversation_id).first()
-    if not budget:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Budget not found for this conversation ID"
-        )
-    
-    budget.budget = budget_data.budget
-    db.commit()
-    db.refresh(budget)
-    return budget
-
-@app.delete("/budgets", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_budget(
-    conversation_id: str = Header(..., alias="X-Conversation-ID"),
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    """Delete a budget by conversation ID"""
-    budget = db.query(Budget).filter(Budget.conversation_id == conversation_id).first()
-    if not budget:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Budget not found for this conversation ID"
-        )
-    
-    db.delete(budget)
-    db.commit()
-    return None
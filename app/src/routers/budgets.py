@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..cache import cache, cached, invalidates
+from ..db import Budget, get_db
+from ..limits import DEFAULT_PAGE_SIZE, MAX_BATCH_SIZE, MAX_PAGE_SIZE, packet_sized_chunks
+from ..schemas import BudgetBatchItem, BudgetCreate, BudgetPage, BudgetResponse, BudgetUpdate
+from ..streaming import json_page_response
+
+router = APIRouter(prefix="/budgets", tags=["budgets"])
+
+@router.post("", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("budget:{conversation_id}")
+async def create_budget(
+    budget_data: BudgetCreate,
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a new budget for a conversation ID"""
+    # A duplicate primary key means the budget already exists
+    try:
+        await db.execute(insert(Budget).values(conversation_id=conversation_id, budget=budget_data.budget))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Budget already exists for this conversation ID"
+        )
+    
+    return ORJSONResponse(
+        {"conversation_id": conversation_id, "budget": budget_data.budget},
+        status_code=status.HTTP_201_CREATED
+    )
+
+@router.post(":batch", status_code=status.HTTP_204_NO_CONTENT)
+async def upsert_budgets(
+    items: List[BudgetBatchItem] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create or replace budgets for many conversation IDs in as few statements as fit in a packet"""
+    # Large batches are split so no single INSERT exceeds max_allowed_packet; one transaction covers all
+    for rows in packet_sized_chunks(item.model_dump() for item in items):
+        stmt = mysql_insert(Budget).values(rows)
+        stmt = stmt.on_duplicate_key_update(budget=stmt.inserted.budget)
+        await db.execute(stmt)
+    await db.commit()
+    await cache.invalidate(*(f"budget:{item.conversation_id}" for item in items))
+    return None
+
+@router.get("", response_model=BudgetResponse)
+@cached("budget:{conversation_id}")
+async def read_budget(
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Retrieve a budget by conversation ID"""
+    budget = await db.get(Budget, conversation_id)
+    if not budget:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget not found for this conversation ID"
+        )
+    return {"conversation_id": budget.conversation_id, "budget": budget.budget}
+
+@router.get("/all", response_model=BudgetPage)
+async def read_all_budgets(
+    after: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    full: bool = False
+):
+    """Retrieve a page of conversation IDs with a budget, including the budget text when `full` is set"""
+    columns = (Budget.conversation_id, Budget.budget) if full else (Budget.conversation_id,)
+    # Keyset pagination: seek past the cursor on the primary key instead of using OFFSET
+    stmt = select(*columns).order_by(Budget.conversation_id)
+    if after is not None:
+        stmt = stmt.where(Budget.conversation_id > after)
+    return await json_page_response(stmt, limit)
+
+@router.put("", response_model=BudgetResponse)
+@invalidates("budget:{conversation_id}")
+async def update_budget(
+    budget_data: BudgetUpdate,
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a budget by conversation ID"""
+    # rowcount counts matched rows (the MySQL dialects enable CLIENT_FOUND_ROWS),
+    # so an update that leaves the text unchanged is not reported as missing
+    result = await db.execute(
+        update(Budget).where(Budget.conversation_id == conversation_id).values(budget=budget_data.budget)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget not found for this conversation ID"
+        )
+    
+    await db.commit()
+    return ORJSONResponse({"conversation_id": conversation_id, "budget": budget_data.budget})
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+@invalidates("budget:{conversation_id}")
+async def delete_budget(
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a budget by conversation ID"""
+    result = await db.execute(delete(Budget).where(Budget.conversation_id == conversation_id))
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget not found for this conversation ID"
+        )
+    
+    await db.commit()
+    return None
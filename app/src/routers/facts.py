@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..cache import cache, cached, invalidates
+from ..db import Fact, get_db
+from ..limits import DEFAULT_PAGE_SIZE, MAX_BATCH_SIZE, MAX_PAGE_SIZE, packet_sized_chunks
+from ..schemas import FactBatchItem, FactCreate, FactPage, FactResponse, FactUpdate
+from ..streaming import json_page_response
+
+router = APIRouter(prefix="/facts", tags=["facts"])
+
+@router.post("", response_model=FactResponse, status_code=status.HTTP_201_CREATED)
+@invalidates("fact:{conversation_id}")
+async def create_fact(
+    fact_data: FactCreate,
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a new fact for a conversation ID"""
+    # A duplicate primary key means the fact already exists
+    try:
+        await db.execute(insert(Fact).values(conversation_id=conversation_id, fact=fact_data.fact))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Fact already exists for this conversation ID"
+        )
+    
+    return ORJSONResponse(
+        {"conversation_id": conversation_id, "fact": fact_data.fact},
+        status_code=status.HTTP_201_CREATED
+    )
+
+@router.post(":batch", status_code=status.HTTP_204_NO_CONTENT)
+async def upsert_facts(
+    items: List[FactBatchItem] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create or replace facts for many conversation IDs in as few statements as fit in a packet"""
+    # Large batches are split so no single INSERT exceeds max_allowed_packet; one transaction covers all
+    for rows in packet_sized_chunks(item.model_dump() for item in items):
+        stmt = mysql_insert(Fact).values(rows)
+        stmt = stmt.on_duplicate_key_update(fact=stmt.inserted.fact)
+        await db.execute(stmt)
+    await db.commit()
+    await cache.invalidate(*(f"fact:{item.conversation_id}" for item in items))
+    return None
+
+@router.get("", response_model=FactResponse)
+@cached("fact:{conversation_id}")
+async def read_fact(
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Retrieve a fact by conversation ID"""
+    fact = await db.get(Fact, conversation_id)
+    if not fact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fact not found for this conversation ID"
+        )
+    return {"conversation_id": fact.conversation_id, "fact": fact.fact}
+
+@router.get("/all", response_model=FactPage)
+async def read_all_facts(
+    after: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    full: bool = False
+):
+    """Retrieve a page of conversation IDs with a fact, including the fact text when `full` is set"""
+    columns = (Fact.conversation_id, Fact.fact) if full else (Fact.conversation_id,)
+    # Keyset pagination: seek past the cursor on the primary key instead of using OFFSET
+    stmt = select(*columns).order_by(Fact.conversation_id)
+    if after is not None:
+        stmt = stmt.where(Fact.conversation_id > after)
+    return await json_page_response(stmt, limit)
+
+@router.put("", response_model=FactResponse)
+@invalidates("fact:{conversation_id}")
+async def update_fact(
+    fact_data: FactUpdate,
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a fact by conversation ID"""
+    # rowcount counts matched rows (the MySQL dialects enable CLIENT_FOUND_ROWS),
+    # so an update that leaves the text unchanged is not reported as missing
+    result = await db.execute(
+        update(Fact).where(Fact.conversation_id == conversation_id).values(fact=fact_data.fact)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fact not found for this conversation ID"
+        )
+    
+    await db.commit()
+    return ORJSONResponse({"conversation_id": conversation_id, "fact": fact_data.fact})
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+@invalidates("fact:{conversation_id}")
+async def delete_fact(
+    conversation_id: str = Header(..., alias="X-Conversation-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a fact by conversation ID"""
+    result = await db.execute(delete(Fact).where(Fact.conversation_id == conversation_id))
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fact not found for this conversation ID"
+        )
+    
+    await db.commit()
+    return None
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import List, Optional, Union
+
+# Pydantic models
+class ConversationRef(BaseModel):
+    conversation_id: str
+
+class FactCreate(BaseModel):
+    fact: str
+
+class FactBatchItem(BaseModel):
+    conversation_id: str
+    fact: str
+
+class FactUpdate(BaseModel):
+    fact: str
+
+class FactResponse(BaseModel):
+    conversation_id: str
+    fact: str
+    
+    class Config:
+        from_attributes = True
+
+class FactPage(BaseModel):
+    items: List[Union[FactResponse, ConversationRef]]
+    next: Optional[str] = None
+
+class BudgetCreate(BaseModel):
+    budget: str
+
+class BudgetBatchItem(BaseModel):
+    conversation_id: str
+    budget: str
+
+class BudgetUpdate(BaseModel):
+    budget: str
+
+class BudgetResponse(BaseModel):
+    conversation_id: str
+    budget: str
+    
+    class Config:
+        from_attributes = True
+
+class BudgetPage(BaseModel):
+    items: List[Union[BudgetResponse, ConversationRef]]
+    next: Optional[str] = None
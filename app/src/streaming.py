@@ -0,0 +1,46 @@
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import orjson
+import os
+
+from .db import SessionLocal
+
+# Rows fetched per round trip when streaming list endpoints
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "200"))
+
+async def json_page_response(stmt, limit: int) -> StreamingResponse:
+    """Run up to `limit` rows of `stmt` and stream them as {"items": [...], "next": cursor}
+
+    `stmt` must select and be ordered by conversation_id; `next` is the last
+    conversation ID of a full page, or null when there are no more rows.
+    The query is executed before the response is built, so pool timeouts and
+    database errors still surface as a 500 instead of a truncated 200.
+    """
+    db = SessionLocal()
+    try:
+        result = await db.stream(stmt.limit(limit).execution_options(yield_per=STREAM_BATCH_SIZE))
+    except BaseException:
+        await db.close()
+        raise
+    # The generator closes the session when the body ends or fails; the background task
+    # covers a body that is never iterated (close() is safe to call twice)
+    return StreamingResponse(
+        _encode_page(db, result, limit),
+        media_type="application/json",
+        background=BackgroundTask(db.close)
+    )
+
+async def _encode_page(db, result, limit: int):
+    try:
+        yield b'{"items":['
+        separator = b""
+        count = 0
+        last_id = None
+        async for partition in result.mappings().partitions():
+            yield separator + b",".join(orjson.dumps(dict(row)) for row in partition)
+            separator = b","
+            count += len(partition)
+            last_id = partition[-1]["conversation_id"]
+        yield b'],"next":' + orjson.dumps(last_id if count == limit else None) + b"}"
+    finally:
+        await db.close()
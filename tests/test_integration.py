@@ -1,455 +1,778 @@
+import asyncio
 import unittest
+import httpx
+import orjson
 import requests
-import time
 import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 
+# Upper bound on requests a test sends at once; sizes the session's connection pool
+MAX_CONCURRENT_REQUESTS = 50
+# Seconds before a request with no explicit timeout fails instead of hanging the suite
+REQUEST_TIMEOUT = 2.0
+# File the API creates once it has started (see READY_FILE in the README); unset to poll /health only
+READY_FILE = os.getenv("READY_FILE")
+# Set IN_PROCESS_TESTS=1 to call the app in-process through Starlette's TestClient instead of over HTTP
+IN_PROCESS_TESTS = os.getenv("IN_PROCESS_TESTS") == "1"
 
-class TestFactsAPI(unittest.TestCase):
-    """Integration tests for Facts API"""
+# TestClient wrapping the app while IN_PROCESS_TESTS is set; started in setUpModule
+_asgi_client = None
+
+
+def setUpModule():
+    """Start the app in-process (running its lifespan) when IN_PROCESS_TESTS is set"""
+    global _asgi_client
+    if not IN_PROCESS_TESTS:
+        return
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from starlette.testclient import TestClient
+    from app.src.main import app
+    _asgi_client = TestClient(app)
+    _asgi_client.__enter__()
+
+
+def tearDownModule():
+    """Shut the in-process app down"""
+    if _asgi_client is not None:
+        _asgi_client.__exit__(None, None, None)
+
+
+class ASGIAdapter(HTTPAdapter):
+    """Transport adapter that hands requests to the in-process TestClient instead of a socket"""
+    
+    def send(self, request, **kwargs):
+        asgi_response = _asgi_client.request(
+            request.method, request.url, headers=dict(request.headers), content=request.body
+        )
+        response = requests.Response()
+        response.status_code = asgi_response.status_code
+        response.reason = asgi_response.reason_phrase
+        response.headers = CaseInsensitiveDict(asgi_response.headers)
+        response._content = asgi_response.content
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class TimedSession(requests.Session):
+    """Session that applies REQUEST_TIMEOUT to every request that doesn't set its own"""
+    
+    def send(self, request, **kwargs):
+        # Overriding send rather than request also covers prepared requests sent directly
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = REQUEST_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+def create_session(api_token):
+    """Create a keep-alive session that authenticates every request with `api_token`"""
+    session = TimedSession()
+    if _asgi_client is not None:
+        session.mount("http://", ASGIAdapter())
+    else:
+        session.mount(
+            "http://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=0)
+        )
+    session.headers.update({"Authorization": f"Bearer {api_token}"})
+    return session
+
+
+def wait_for_ready_file(path, timeout=30):
+    """Block until `path` exists, via inotify when inotify_simple is installed, else by polling"""
+    deadline = time.monotonic() + timeout
+    try:
+        from inotify_simple import INotify, flags
+        inotify = INotify()
+        inotify.add_watch(os.path.dirname(path) or ".", flags.CREATE | flags.MOVED_TO)
+    except (ImportError, OSError):
+        inotify = None
+    delay = 0.02
+    try:
+        # Checked after the watch is in place so a file created in between isn't missed
+        while not os.path.exists(path):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise Exception(f"{path} was not created in time")
+            if inotify is not None:
+                inotify.read(timeout=int(remaining * 1000))
+            else:
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 1.0)
+    finally:
+        if inotify is not None:
+            inotify.close()
+
+
+# Base URLs that already answered /health; later test classes skip the probe
+_ready_urls = set()
+
+
+def wait_for_api(session, base_url, retries=30):
+    """Wait for /health to answer, letting urllib3 retry with exponential backoff (capped at 1s)"""
+    # An in-process app is already up once setUpModule has run its lifespan
+    if _asgi_client is not None or base_url in _ready_urls:
+        return
+    if READY_FILE:
+        # The probe below then normally succeeds on its first attempt
+        wait_for_ready_file(READY_FILE)
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.02,
+        backoff_max=1.0,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    # Only the health probe retries; other requests keep failing fast
+    session.mount(f"{base_url}/health", HTTPAdapter(max_retries=retry))
+    try:
+        session.get(f"{base_url}/health", timeout=0.5).raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise Exception("API did not become ready in time") from e
+    _ready_urls.add(base_url)
+
+
+def send_concurrently(base_url, headers, calls):
+    """Send (method, path, kwargs) calls concurrently over one AsyncClient and return the responses"""
+    if _asgi_client is not None:
+        def send(call):
+            method, path, kwargs = call
+            kwargs = {**kwargs, "headers": {**headers, **kwargs.get("headers", {})}}
+            return _asgi_client.request(method, path, **kwargs)
+        with ThreadPoolExecutor(max_workers=min(len(calls), MAX_CONCURRENT_REQUESTS)) as executor:
+            return list(executor.map(send, calls))
+    
+    async def send_all():
+        limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS)
+        async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=REQUEST_TIMEOUT, limits=limits) as client:
+            return await asyncio.gather(
+                *(client.request(method, path, **kwargs) for method, path, kwargs in calls)
+            )
+    return asyncio.run(send_all())
+
+
+def delete_rows(base_url, headers, path, conversation_ids):
+    """DELETE every conversation ID under `path` and return the IDs that were not confirmed gone"""
+    conversation_ids = list(conversation_ids)
+    try:
+        responses = send_concurrently(
+            base_url,
+            headers,
+            [("DELETE", path, {"headers": {"X-Conversation-ID": conversation_id}}) for conversation_id in conversation_ids]
+        )
+    except Exception as exc:  # httpx.HTTPError over the network; whatever the app raised in-process
+        print(f"Cleanup of {path} failed: {exc!r}", file=sys.stderr)
+        return conversation_ids
+    # 404 means a test already deleted the row itself
+    return [
+        conversation_id
+        for conversation_id, response in zip(conversation_ids, responses)
+        if response.status_code not in (204, 404)
+    ]
+
+class FactsAPITestCase(unittest.TestCase):
+    """Shared fixtures for the Facts API tests"""
     
     BASE_URL = "http://localhost:8000"
+    # Endpoint URLs built once at class load
+    HEALTH_URL = f"{BASE_URL}/health"
+    FACTS_URL = f"{BASE_URL}/facts"
+    FACTS_ALL_URL = f"{BASE_URL}/facts/all"
+    FACTS_BATCH_URL = f"{BASE_URL}/facts:batch"
     API_TOKEN = os.getenv("API_TOKEN", "my-secret-token")
+    # Shared by every call that doesn't go through the session (which sets it itself)
+    AUTH_HEADERS = {"Authorization": f"Bearer {API_TOKEN}"}
+    
+    # Payloads are built once at class load rather than in every setUp
+    TEST_FACT = "This is a test fact " * 100  # A large fact
+    UPDATED_FACT = "Updated fact " * 100
+    LARGE_FACT = "A" * 10000  # Larger than 8KB
+    # Request bodies serialized once and sent as raw bytes
+    TEST_FACT_BODY = orjson.dumps({"fact": TEST_FACT})
+    UPDATED_FACT_BODY = orjson.dumps({"fact": UPDATED_FACT})
+    LARGE_FACT_BODY = orjson.dumps({"fact": LARGE_FACT})
     
     @classmethod
     def setUpClass(cls):
         """Wait for API to be ready"""
-        max_retries = 30
-        for i in range(max_retries):
-            try:
-                response = requests.get(f"{cls.BASE_URL}/health", timeout=1)
-                if response.status_code == 200:
-                    print("API is ready")
-                    return
-            except requests.exceptions.RequestException:
-                pass
-            time.sleep(1)
-        raise Exception("API did not become ready in time")
+        # Shared session so tests reuse keep-alive connections instead of reconnecting per request
+        cls.session = create_session(cls.API_TOKEN)
+        wait_for_api(cls.session, cls.BASE_URL)
+        # Conversation IDs the tests created; deleted together in tearDownClass
+        cls._dirty_ids = set()
+        print("API is ready")
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Delete every row the class's tests created, then close the shared session"""
+        if cls._dirty_ids:
+            left_behind = delete_rows(cls.BASE_URL, cls.AUTH_HEADERS, "/facts", cls._dirty_ids)
+            if left_behind:
+                print(f"{cls.__name__} left {len(left_behind)} facts behind: {sorted(left_behind)}", file=sys.stderr)
+        cls.session.close()
     
     def setUp(self):
         """Set up test fixtures"""
-        self.headers = {
-            "Authorization": f"Bearer {self.API_TOKEN}",
-            "X-Conversation-ID": "test-conversation-001"
-        }
-        self.test_fact = "This is a test fact " * 100  # Create a large fact
-    
-    def tearDown(self):
-        """Clean up after each test"""
-        try:
-            requests.delete(
-                f"{self.BASE_URL}/facts",
-                headers=self.headers
-            )
-        except requests.exceptions.RequestException:
-            pass
+        # Unique per test so tests can run in parallel against the same API
+        self.conversation_id = f"test-conversation-{uuid.uuid4().hex}"
+        self.headers = {"X-Conversation-ID": self.conversation_id, "Content-Type": "application/json"}
+    
+    def _create_fact(self, body=None, conversation_id=None):
+        """POST a fact (TEST_FACT_BODY by default) and record its conversation ID for cleanup"""
+        conversation_id = conversation_id or self.conversation_id
+        self._dirty_ids.add(conversation_id)
+        return self.session.post(
+            self.FACTS_URL,
+            data=body or self.TEST_FACT_BODY,
+            headers={**self.headers, "X-Conversation-ID": conversation_id}
+        )
+
+
+class TestFactsAPI(FactsAPITestCase):
+    """Integration tests for Facts API"""
     
     def test_health_check(self):
         """Test health check endpoint"""
-        response = requests.get(f"{self.BASE_URL}/health")
+        response = self.session.get(self.HEALTH_URL)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(), {"status": "healthy"})
+        self.assertEqual(orjson.loads(response.content), {"status": "healthy"})
     
     def test_create_fact(self):
         """Test creating a new fact"""
-        response = requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": self.test_fact},
-            headers=self.headers
-        )
+        response = self._create_fact()
         self.assertEqual(response.status_code, 201)
-        data = response.json()
-        self.assertEqual(data["conversation_id"], "test-conversation-001")
-        self.assertEqual(data["fact"], self.test_fact)
+        data = orjson.loads(response.content)
+        self.assertEqual(data["conversation_id"], self.conversation_id)
+        self.assertEqual(data["fact"], self.TEST_FACT)
     
     def test_create_fact_without_auth(self):
         """Test creating a fact without authentication"""
-        headers = {"X-Conversation-ID": "test-conversation-001"}
-        response = requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": self.test_fact},
+        # A None value drops the session-level Authorization header
+        headers = {**self.headers, "Authorization": None}
+        response = self.session.post(
+            self.FACTS_URL,
+            data=self.TEST_FACT_BODY,
             headers=headers
         )
         self.assertEqual(response.status_code, 403)
     
     def test_create_fact_with_invalid_token(self):
         """Test creating a fact with invalid token"""
-        headers = {
-            "Authorization": "Bearer invalid-token",
-            "X-Conversation-ID": "test-conversation-001"
-        }
-        response = requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": self.test_fact},
+        headers = {**self.headers, "Authorization": "Bearer invalid-token"}
+        response = self.session.post(
+            self.FACTS_URL,
+            data=self.TEST_FACT_BODY,
             headers=headers
         )
         self.assertEqual(response.status_code, 401)
     
-    def test_read_fact(self):
-        """Test reading a fact"""
-        # Create a fact first
-        requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": self.test_fact},
-            headers=self.headers
+    def test_concurrent_reads(self):
+        """Test many concurrent reads of distinct facts"""
+        # Distinct rows miss the response cache, so every read checks out a database connection
+        conversation_ids = [f"{self.conversation_id}-read-{i}" for i in range(200)]
+        self._dirty_ids.update(conversation_ids)
+        response = self.session.post(
+            self.FACTS_BATCH_URL,
+            json=[{"conversation_id": conversation_id, "fact": self.TEST_FACT} for conversation_id in conversation_ids]
         )
+        self.assertEqual(response.status_code, 204)
         
-        # Read the fact
-        response = requests.get(
-            f"{self.BASE_URL}/facts",
-            headers=self.headers
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["conversation_id"], "test-conversation-001")
-        self.assertEqual(data["fact"], self.test_fact)
+        def read(conversation_id):
+            return self.session.get(self.FACTS_URL, headers={"X-Conversation-ID": conversation_id}).status_code
+        
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            status_codes = list(executor.map(read, conversation_ids))
+        self.assertEqual(status_codes, [200] * 200)
     
     def test_read_nonexistent_fact(self):
         """Test reading a fact that doesn't exist"""
-        response = requests.get(
-            f"{self.BASE_URL}/facts",
+        response = self.session.get(
+            self.FACTS_URL,
             headers=self.headers
         )
         self.assertEqual(response.status_code, 404)
     
-    def test_update_fact(self):
-        """Test updating a fact"""
-        # Create a fact first
-        requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": self.test_fact},
-            headers=self.headers
-        )
-        
-        # Update the fact
-        updated_fact = "Updated fact " * 100
-        response = requests.put(
-            f"{self.BASE_URL}/facts",
-            json={"fact": updated_fact},
-            headers=self.headers
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["fact"], updated_fact)
-    
     def test_update_nonexistent_fact(self):
         """Test updating a fact that doesn't exist"""
-        response = requests.put(
-            f"{self.BASE_URL}/facts",
+        response = self.session.put(
+            self.FACTS_URL,
             json={"fact": "some fact"},
             headers=self.headers
         )
         self.assertEqual(response.status_code, 404)
     
-    def test_delete_fact(self):
-        """Test deleting a fact"""
-        # Create a fact first
-        requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": self.test_fact},
+    def test_delete_nonexistent_fact(self):
+        """Test deleting a fact that doesn't exist"""
+        response = self.session.delete(
+            self.FACTS_URL,
             headers=self.headers
         )
+        self.assertEqual(response.status_code, 404)
+    
+    def test_batch_upsert_facts(self):
+        """Test creating and replacing facts in one batch request"""
+        items = [{"conversation_id": f"{self.conversation_id}-batch-{i}", "fact": f"Batch fact {i}"} for i in range(3)]
+        self._dirty_ids.update(item["conversation_id"] for item in items)
+        response = self.session.post(self.FACTS_BATCH_URL, json=items)
+        self.assertEqual(response.status_code, 204)
         
-        # Delete the fact
-        response = requests.delete(
-            f"{self.BASE_URL}/facts",
-            headers=self.headers
+        # Read one back so the response cache holds a copy the next batch must invalidate
+        response = self.session.get(
+            self.FACTS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-batch-0"}
+        )
+        self.assertEqual(orjson.loads(response.content)["fact"], "Batch fact 0")
+        
+        # Replace an existing fact in a second batch
+        response = self.session.post(
+            self.FACTS_BATCH_URL,
+            json=[{"conversation_id": f"{self.conversation_id}-batch-0", "fact": "Replaced fact"}]
         )
         self.assertEqual(response.status_code, 204)
         
-        # Verify it's deleted
-        response = requests.get(
-            f"{self.BASE_URL}/facts",
-            headers=self.headers
+        response = self.session.get(
+            self.FACTS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-batch-0"}
         )
-        self.assertEqual(response.status_code, 404)
-    
-    def test_delete_nonexistent_fact(self):
-        """Test deleting a fact that doesn't exist"""
-        response = requests.delete(
-            f"{self.BASE_URL}/facts",
-            headers=self.headers
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content)["fact"], "Replaced fact")
+        response = self.session.get(
+            self.FACTS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-batch-2"}
         )
-        self.assertEqual(response.status_code, 404)
+        self.assertEqual(orjson.loads(response.content)["fact"], "Batch fact 2")
     
     def test_large_fact(self):
         """Test storing a very large fact (>8KB)"""
-        # Create a fact larger than 8KB
-        large_fact = "A" * 10000
-        headers = {
-            "Authorization": f"Bearer {self.API_TOKEN}",
-            "X-Conversation-ID": "test-large-fact"
-        }
+        conversation_id = f"{self.conversation_id}-large"
         
-        response = requests.post(
-            f"{self.BASE_URL}/facts",
-            json={"fact": large_fact},
-            headers=headers
-        )
+        response = self._create_fact(self.LARGE_FACT_BODY, conversation_id)
         self.assertEqual(response.status_code, 201)
         
         # Verify we can read it back
-        response = requests.get(
-            f"{self.BASE_URL}/facts",
-            headers=headers
+        response = self.session.get(
+            self.FACTS_URL,
+            headers={"X-Conversation-ID": conversation_id}
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
+        data = orjson.loads(response.content)
         self.assertEqual(len(data["fact"]), 10000)
-        
-        # Clean up
-        requests.delete(f"{self.BASE_URL}/facts", headers=headers)
     
     def test_list_all_facts(self):
         """Test listing all facts"""
-        # Create multiple facts
-        for i in range(3):
-            headers = {
-                "Authorization": f"Bearer {self.API_TOKEN}",
-                "X-Conversation-ID": f"test-conv-{i}"
-            }
-            requests.post(
-                f"{self.BASE_URL}/facts",
-                json={"fact": f"Fact {i}"},
-                headers=headers
-            )
+        # Create multiple facts concurrently
+        self._dirty_ids.update(f"{self.conversation_id}-{i}" for i in range(3))
+        responses = send_concurrently(
+            self.BASE_URL,
+            self.AUTH_HEADERS,
+            [
+                ("POST", "/facts", {"json": {"fact": f"Fact {i}"}, "headers": {"X-Conversation-ID": f"{self.conversation_id}-{i}"}})
+                for i in range(3)
+            ]
+        )
+        self.assertEqual([r.status_code for r in responses], [201] * 3)
         
         # List all facts
-        response = requests.get(
-            f"{self.BASE_URL}/facts/all",
-            headers={"Authorization": f"Bearer {self.API_TOKEN}"}
+        response = self.session.get(
+            self.FACTS_ALL_URL
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertGreaterEqual(len(data), 3)
+        items = orjson.loads(response.content)["items"]
+        self.assertGreaterEqual(len(items), 3)
+        self.assertEqual(set(items[0]), {"conversation_id"})
         
-        # Clean up
-        for i in range(3):
-            headers = {
-                "Authorization": f"Bearer {self.API_TOKEN}",
-                "X-Conversation-ID": f"test-conv-{i}"
-            }
-            requests.delete(f"{self.BASE_URL}/facts", headers=headers)
+        # List all facts including their text
+        response = self.session.get(
+            self.FACTS_ALL_URL,
+            params={"full": "true", "after": f"{self.conversation_id}-"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({"conversation_id": f"{self.conversation_id}-0", "fact": "Fact 0"}, orjson.loads(response.content)["items"])
+        
+        # Page through the facts two at a time
+        response = self.session.get(
+            self.FACTS_ALL_URL,
+            params={"after": f"{self.conversation_id}-", "limit": 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content), {
+            "items": [{"conversation_id": f"{self.conversation_id}-0"}, {"conversation_id": f"{self.conversation_id}-1"}],
+            "next": f"{self.conversation_id}-1"
+        })
+        response = self.session.get(
+            self.FACTS_ALL_URL,
+            params={"after": f"{self.conversation_id}-1", "limit": 2}
+        )
+        self.assertEqual(orjson.loads(response.content)["items"][0], {"conversation_id": f"{self.conversation_id}-2"})
 
 
-class TestBudgetsAPI(unittest.TestCase):
-    """Integration tests for Budgets API"""
+class TestExistingFactAPI(FactsAPITestCase):
+    """Integration tests that start from a fact created in setUp"""
+    
+    def setUp(self):
+        """Create the row every test in this class starts from"""
+        super().setUp()
+        self._create_fact()
+        # The row's GET repeats within a test (before and after a write), so prepare it once
+        self.read_request = self.session.prepare_request(
+            requests.Request("GET", self.FACTS_URL, headers=self.headers)
+        )
+    
+    def test_read_fact(self):
+        """Test reading a fact"""
+        # Read the fact
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 200)
+        data = orjson.loads(response.content)
+        self.assertEqual(data["conversation_id"], self.conversation_id)
+        self.assertEqual(data["fact"], self.TEST_FACT)
+    
+    def test_update_fact(self):
+        """Test updating a fact"""
+        # Read it first so the response cache holds a copy the write must invalidate
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 200)
+        
+        # Update the fact
+        response = self.session.put(
+            self.FACTS_URL,
+            data=self.UPDATED_FACT_BODY,
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        data = orjson.loads(response.content)
+        self.assertEqual(data["fact"], self.UPDATED_FACT)
+        
+        # A later read must see the update, not the cached original
+        response = self.session.send(self.read_request)
+        self.assertEqual(orjson.loads(response.content)["fact"], self.UPDATED_FACT)
+    
+    def test_delete_fact(self):
+        """Test deleting a fact"""
+        # Read it first so the response cache holds a copy the write must invalidate
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 200)
+        
+        # Delete the fact
+        response = self.session.delete(
+            self.FACTS_URL,
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 204)
+        self._dirty_ids.discard(self.conversation_id)
+        
+        # Verify it's deleted
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 404)
+
+
+class BudgetsAPITestCase(unittest.TestCase):
+    """Shared fixtures for the Budgets API tests"""
     
     BASE_URL = "http://localhost:8000"
+    # Endpoint URLs built once at class load
+    BUDGETS_URL = f"{BASE_URL}/budgets"
+    BUDGETS_ALL_URL = f"{BASE_URL}/budgets/all"
+    BUDGETS_BATCH_URL = f"{BASE_URL}/budgets:batch"
     API_TOKEN = os.getenv("API_TOKEN", "my-secret-token")
+    # Shared by every call that doesn't go through the session (which sets it itself)
+    AUTH_HEADERS = {"Authorization": f"Bearer {API_TOKEN}"}
+    
+    # Payloads are built once at class load rather than in every setUp
+    TEST_BUDGET = "Item 1: Product A - $100\nItem 2: Service B - $250\n" * 100
+    UPDATED_BUDGET = "Updated Item 1: New Product - $500\n" * 100
+    LARGE_BUDGET = "Activity: Web Development - Price: $5,000 - Details: Full stack development\n" * 1000  # Larger than 50KB
+    # Request bodies serialized once and sent as raw bytes
+    TEST_BUDGET_BODY = orjson.dumps({"budget": TEST_BUDGET})
+    UPDATED_BUDGET_BODY = orjson.dumps({"budget": UPDATED_BUDGET})
+    LARGE_BUDGET_BODY = orjson.dumps({"budget": LARGE_BUDGET})
     
     @classmethod
     def setUpClass(cls):
         """Wait for API to be ready"""
-        max_retries = 30
-        for i in range(max_retries):
-            try:
-                response = requests.get(f"{cls.BASE_URL}/health", timeout=1)
-                if response.status_code == 200:
-                    print("API is ready for budget tests")
-                    return
-            except requests.exceptions.RequestException:
-                pass
-            time.sleep(1)
-        raise Exception("API did not become ready in time")
+        # Shared session so tests reuse keep-alive connections instead of reconnecting per request
+        cls.session = create_session(cls.API_TOKEN)
+        wait_for_api(cls.session, cls.BASE_URL)
+        # Conversation IDs the tests created; deleted together in tearDownClass
+        cls._dirty_ids = set()
+        print("API is ready for budget tests")
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Delete every row the class's tests created, then close the shared session"""
+        if cls._dirty_ids:
+            left_behind = delete_rows(cls.BASE_URL, cls.AUTH_HEADERS, "/budgets", cls._dirty_ids)
+            if left_behind:
+                print(f"{cls.__name__} left {len(left_behind)} budgets behind: {sorted(left_behind)}", file=sys.stderr)
+        cls.session.close()
     
     def setUp(self):
         """Set up test fixtures"""
-        self.headers = {
-            "Authorization": f"Bearer {self.API_TOKEN}",
-            "X-Conversation-ID": "test-budget-conversation-001"
-        }
-        self.test_budget = "Item 1: Product A - $100\nItem 2: Service B - $250\n" * 100
-    
-    def tearDown(self):
-        """Clean up after each test"""
-        try:
-            requests.delete(
-                f"{self.BASE_URL}/budgets",
-                headers=self.headers
-            )
-        except requests.exceptions.RequestException:
-            pass
+        # Unique per test so tests can run in parallel against the same API
+        self.conversation_id = f"test-budget-conversation-{uuid.uuid4().hex}"
+        self.headers = {"X-Conversation-ID": self.conversation_id, "Content-Type": "application/json"}
+    
+    def _create_budget(self, body=None, conversation_id=None):
+        """POST a budget (TEST_BUDGET_BODY by default) and record its conversation ID for cleanup"""
+        conversation_id = conversation_id or self.conversation_id
+        self._dirty_ids.add(conversation_id)
+        return self.session.post(
+            self.BUDGETS_URL,
+            data=body or self.TEST_BUDGET_BODY,
+            headers={**self.headers, "X-Conversation-ID": conversation_id}
+        )
+
+
+class TestBudgetsAPI(BudgetsAPITestCase):
+    """Integration tests for Budgets API"""
     
     def test_create_budget(self):
         """Test creating a new budget"""
-        response = requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": self.test_budget},
-            headers=self.headers
-        )
+        response = self._create_budget()
         self.assertEqual(response.status_code, 201)
-        data = response.json()
-        self.assertEqual(data["conversation_id"], "test-budget-conversation-001")
-        self.assertEqual(data["budget"], self.test_budget)
+        data = orjson.loads(response.content)
+        self.assertEqual(data["conversation_id"], self.conversation_id)
+        self.assertEqual(data["budget"], self.TEST_BUDGET)
     
     def test_create_budget_without_auth(self):
         """Test creating a budget without authentication"""
-        headers = {"X-Conversation-ID": "test-budget-conversation-001"}
-        response = requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": self.test_budget},
+        # A None value drops the session-level Authorization header
+        headers = {**self.headers, "Authorization": None}
+        response = self.session.post(
+            self.BUDGETS_URL,
+            data=self.TEST_BUDGET_BODY,
             headers=headers
         )
         self.assertEqual(response.status_code, 403)
     
     def test_create_budget_with_invalid_token(self):
         """Test creating a budget with invalid token"""
-        headers = {
-            "Authorization": "Bearer invalid-token",
-            "X-Conversation-ID": "test-budget-conversation-001"
-        }
-        response = requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": self.test_budget},
+        headers = {**self.headers, "Authorization": "Bearer invalid-token"}
+        response = self.session.post(
+            self.BUDGETS_URL,
+            data=self.TEST_BUDGET_BODY,
             headers=headers
         )
         self.assertEqual(response.status_code, 401)
     
-    def test_read_budget(self):
-        """Test reading a budget"""
-        # Create a budget first
-        requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": self.test_budget},
-            headers=self.headers
+    def test_concurrent_reads(self):
+        """Test many concurrent reads of distinct budgets"""
+        # Distinct rows miss the response cache, so every read checks out a database connection
+        conversation_ids = [f"{self.conversation_id}-read-{i}" for i in range(200)]
+        self._dirty_ids.update(conversation_ids)
+        response = self.session.post(
+            self.BUDGETS_BATCH_URL,
+            json=[{"conversation_id": conversation_id, "budget": self.TEST_BUDGET} for conversation_id in conversation_ids]
         )
+        self.assertEqual(response.status_code, 204)
         
-        # Read the budget
-        response = requests.get(
-            f"{self.BASE_URL}/budgets",
-            headers=self.headers
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["conversation_id"], "test-budget-conversation-001")
-        self.assertEqual(data["budget"], self.test_budget)
+        def read(conversation_id):
+            return self.session.get(self.BUDGETS_URL, headers={"X-Conversation-ID": conversation_id}).status_code
+        
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            status_codes = list(executor.map(read, conversation_ids))
+        self.assertEqual(status_codes, [200] * 200)
     
     def test_read_nonexistent_budget(self):
         """Test reading a budget that doesn't exist"""
-        response = requests.get(
-            f"{self.BASE_URL}/budgets",
+        response = self.session.get(
+            self.BUDGETS_URL,
             headers=self.headers
         )
         self.assertEqual(response.status_code, 404)
     
-    def test_update_budget(self):
-        """Test updating a budget"""
-        # Create a budget first
-        requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": self.test_budget},
-            headers=self.headers
-        )
-        
-        # Update the budget
-        updated_budget = "Updated Item 1: New Product - $500\n" * 100
-        response = requests.put(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": updated_budget},
-            headers=self.headers
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["budget"], updated_budget)
-    
     def test_update_nonexistent_budget(self):
         """Test updating a budget that doesn't exist"""
-        response = requests.put(
-            f"{self.BASE_URL}/budgets",
+        response = self.session.put(
+            self.BUDGETS_URL,
             json={"budget": "some budget"},
             headers=self.headers
         )
         self.assertEqual(response.status_code, 404)
     
-    def test_delete_budget(self):
-        """Test deleting a budget"""
-        # Create a budget first
-        requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": self.test_budget},
+    def test_delete_nonexistent_budget(self):
+        """Test deleting a budget that doesn't exist"""
+        response = self.session.delete(
+            self.BUDGETS_URL,
             headers=self.headers
         )
+        self.assertEqual(response.status_code, 404)
+    
+    def test_batch_upsert_budgets(self):
+        """Test creating and replacing budgets in one batch request"""
+        items = [{"conversation_id": f"{self.conversation_id}-batch-{i}", "budget": f"Batch budget {i}"} for i in range(3)]
+        self._dirty_ids.update(item["conversation_id"] for item in items)
+        response = self.session.post(self.BUDGETS_BATCH_URL, json=items)
+        self.assertEqual(response.status_code, 204)
         
-        # Delete the budget
-        response = requests.delete(
-            f"{self.BASE_URL}/budgets",
-            headers=self.headers
+        # Read one back so the response cache holds a copy the next batch must invalidate
+        response = self.session.get(
+            self.BUDGETS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-batch-0"}
+        )
+        self.assertEqual(orjson.loads(response.content)["budget"], "Batch budget 0")
+        
+        # Replace an existing budget in a second batch
+        response = self.session.post(
+            self.BUDGETS_BATCH_URL,
+            json=[{"conversation_id": f"{self.conversation_id}-batch-0", "budget": "Replaced budget"}]
         )
         self.assertEqual(response.status_code, 204)
         
-        # Verify it's deleted
-        response = requests.get(
-            f"{self.BASE_URL}/budgets",
-            headers=self.headers
+        response = self.session.get(
+            self.BUDGETS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-batch-0"}
         )
-        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content)["budget"], "Replaced budget")
+        response = self.session.get(
+            self.BUDGETS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-batch-2"}
+        )
+        self.assertEqual(orjson.loads(response.content)["budget"], "Batch budget 2")
     
-    def test_delete_nonexistent_budget(self):
-        """Test deleting a budget that doesn't exist"""
-        response = requests.delete(
-            f"{self.BASE_URL}/budgets",
-            headers=self.headers
+    def test_batch_upsert_large_budgets(self):
+        """Test a batch too large for one INSERT packet (>4MB), which the API splits into several"""
+        items = [{"conversation_id": f"{self.conversation_id}-big-{i}", "budget": self.LARGE_BUDGET} for i in range(60)]
+        self._dirty_ids.update(item["conversation_id"] for item in items)
+        response = self.session.post(self.BUDGETS_BATCH_URL, data=orjson.dumps(items), headers=self.headers, timeout=10)
+        self.assertEqual(response.status_code, 204)
+        
+        response = self.session.get(
+            self.BUDGETS_URL,
+            headers={"X-Conversation-ID": f"{self.conversation_id}-big-59"}
         )
-        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content)["budget"], self.LARGE_BUDGET)
     
     def test_large_budget(self):
         """Test storing a very large budget (>50KB)"""
-        # Create a budget larger than 50KB
-        large_budget = "Activity: Web Development - Price: $5,000 - Details: Full stack development\n" * 1000
-        headers = {
-            "Authorization": f"Bearer {self.API_TOKEN}",
-            "X-Conversation-ID": "test-large-budget"
-        }
+        conversation_id = f"{self.conversation_id}-large"
         
-        response = requests.post(
-            f"{self.BASE_URL}/budgets",
-            json={"budget": large_budget},
-            headers=headers
-        )
+        response = self._create_budget(self.LARGE_BUDGET_BODY, conversation_id)
         self.assertEqual(response.status_code, 201)
         
         # Verify we can read it back
-        response = requests.get(
-            f"{self.BASE_URL}/budgets",
-            headers=headers
+        response = self.session.get(
+            self.BUDGETS_URL,
+            headers={"X-Conversation-ID": conversation_id}
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
+        data = orjson.loads(response.content)
         self.assertGreater(len(data["budget"]), 50000)
-        
-        # Clean up
-        requests.delete(f"{self.BASE_URL}/budgets", headers=headers)
     
     def test_list_all_budgets(self):
         """Test listing all budgets"""
-        # Create multiple budgets
-        for i in range(3):
-            headers = {
-                "Authorization": f"Bearer {self.API_TOKEN}",
-                "X-Conversation-ID": f"test-budget-conv-{i}"
-            }
-            requests.post(
-                f"{self.BASE_URL}/budgets",
-                json={"budget": f"Budget {i}: Item A - $100\nItem B - $200"},
-                headers=headers
-            )
+        # Create multiple budgets concurrently
+        self._dirty_ids.update(f"{self.conversation_id}-{i}" for i in range(3))
+        responses = send_concurrently(
+            self.BASE_URL,
+            self.AUTH_HEADERS,
+            [
+                ("POST", "/budgets", {"json": {"budget": f"Budget {i}: Item A - $100\nItem B - $200"}, "headers": {"X-Conversation-ID": f"{self.conversation_id}-{i}"}})
+                for i in range(3)
+            ]
+        )
+        self.assertEqual([r.status_code for r in responses], [201] * 3)
         
         # List all budgets
-        response = requests.get(
-            f"{self.BASE_URL}/budgets/all",
-            headers={"Authorization": f"Bearer {self.API_TOKEN}"}
+        response = self.session.get(
+            self.BUDGETS_ALL_URL
+        )
+        self.assertEqual(response.status_code, 200)
+        items = orjson.loads(response.content)["items"]
+        self.assertGreaterEqual(len(items), 3)
+        self.assertEqual(set(items[0]), {"conversation_id"})
+        
+        # List all budgets including their text
+        response = self.session.get(
+            self.BUDGETS_ALL_URL,
+            params={"full": "true", "after": f"{self.conversation_id}-"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn({"conversation_id": f"{self.conversation_id}-0", "budget": "Budget 0: Item A - $100\nItem B - $200"}, orjson.loads(response.content)["items"])
+        
+        # Page through the budgets two at a time
+        response = self.session.get(
+            self.BUDGETS_ALL_URL,
+            params={"after": f"{self.conversation_id}-", "limit": 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(orjson.loads(response.content), {
+            "items": [{"conversation_id": f"{self.conversation_id}-0"}, {"conversation_id": f"{self.conversation_id}-1"}],
+            "next": f"{self.conversation_id}-1"
+        })
+        response = self.session.get(
+            self.BUDGETS_ALL_URL,
+            params={"after": f"{self.conversation_id}-1", "limit": 2}
+        )
+        self.assertEqual(orjson.loads(response.content)["items"][0], {"conversation_id": f"{self.conversation_id}-2"})
+
+
+class TestExistingBudgetAPI(BudgetsAPITestCase):
+    """Integration tests that start from a budget created in setUp"""
+    
+    def setUp(self):
+        """Create the row every test in this class starts from"""
+        super().setUp()
+        self._create_budget()
+        # The row's GET repeats within a test (before and after a write), so prepare it once
+        self.read_request = self.session.prepare_request(
+            requests.Request("GET", self.BUDGETS_URL, headers=self.headers)
         )
+    
+    def test_read_budget(self):
+        """Test reading a budget"""
+        # Read the budget
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 200)
+        data = orjson.loads(response.content)
+        self.assertEqual(data["conversation_id"], self.conversation_id)
+        self.assertEqual(data["budget"], self.TEST_BUDGET)
+    
+    def test_update_budget(self):
+        """Test updating a budget"""
+        # Read it first so the response cache holds a copy the write must invalidate
+        response = self.session.send(self.read_request)
         self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertGreaterEqual(len(data), 3)
         
-        # Clean up
-        for i in range(3):
-            headers = {
-                "Authorization": f"Bearer {self.API_TOKEN}",
-                "X-Conversation-ID": f"test-budget-conv-{i}"
-            }
-            requests.delete(f"{self.BASE_URL}/budgets", headers=headers)
+        # Update the budget
+        response = self.session.put(
+            self.BUDGETS_URL,
+            data=self.UPDATED_BUDGET_BODY,
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        data = orjson.loads(response.content)
+        self.assertEqual(data["budget"], self.UPDATED_BUDGET)
+        
+        # A later read must see the update, not the cached original
+        response = self.session.send(self.read_request)
+        self.assertEqual(orjson.loads(response.content)["budget"], self.UPDATED_BUDGET)
+    
+    def test_delete_budget(self):
+        """Test deleting a budget"""
+        # Read it first so the response cache holds a copy the write must invalidate
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 200)
+        
+        # Delete the budget
+        response = self.session.delete(
+            self.BUDGETS_URL,
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 204)
+        self._dirty_ids.discard(self.conversation_id)
+        
+        # Verify it's deleted
+        response = self.session.send(self.read_request)
+        self.assertEqual(response.status_code, 404)
 
 
 if __name__ == "__main__":